@@ -19,6 +19,8 @@ import requests # TODO: use requests instead of urllib
 import configparser # read login info from file
 import os.path # exists, expanduser
 import subprocess # call external tool pdftotext
+import concurrent.futures # download articles in parallel
+import functools # lru_cache
 
 from enum import Enum
 
@@ -83,6 +85,10 @@ DEFAULT_OUT_NAME = 'pd{number}.{ext}'
 OUT_PATTERN_RE = re.compile('.*{number}.*')
 
 
+# number of articles to download in parallel
+MAX_PARALLEL_DOWNLOADS = 10
+
+
 # Base url of the page
 BASE_URL = 'https://perspective-daily.de'
 
@@ -322,10 +328,12 @@ class PerspectiveDailyArticleParser(HTMLParser):
 
 
 
+@functools.lru_cache(maxsize=8)
 def read_known_numbers_from_config(filename, sectionname, keyname):
     '''
     Read list of known numbers from given config file.
-    :return set<int>: list of known numbers
+    The result is cached; append_write_known_numbers_to_config invalidates it.
+    :return frozenset<int>: list of known numbers
     '''
     c = configparser.ConfigParser()
     if not c.read(filename):
@@ -342,7 +350,7 @@ def read_known_numbers_from_config(filename, sectionname, keyname):
         # if keyword does not exist, no articles are known
         LOG.info('There is no key "{}" in section "{}" of file {} with known '\
                 'numbers; assuming none'.format(keyname, sectionname, filename))
-        return set() # empty
+        return frozenset() # empty
     values = set() # collect numbers
     values_strings = re.sub('\s', '', values_one_string).split(',')
     for value in values_strings:
@@ -353,7 +361,7 @@ def read_known_numbers_from_config(filename, sectionname, keyname):
                             value, keyname, sectionname, filename))
             else:
                 values.add(int(value))
-    return values
+    return frozenset(values)
 
 
 def append_write_known_numbers_to_config(filename, sectionname, keyname, numbers, break_after=10):
@@ -397,6 +405,8 @@ def append_write_known_numbers_to_config(filename, sectionname, keyname, numbers
         # write to file
         with open(filename, 'w') as cfg:
             c.write(cfg)
+        # cached content of the file is outdated now
+        read_known_numbers_from_config.cache_clear()
 
 
 
@@ -639,11 +649,23 @@ class Article:
             return self._raw_content
 
 
-def get_many_articles(numbers_or_urls, session, article_format):
+def _get_article(identifier, session, article_format):
+    '''
+    Try to access an article referenced either by url or by number.
+    :return (str|bytes|requests.Response, ArticleFormat): see get_article_by_number
+    '''
+    if is_number(identifier):
+        return get_article_by_number(int(identifier), session, article_format)
+    return get_article_by_url(identifier), None
+
+
+def get_many_articles(numbers_or_urls, session, article_format, max_workers=MAX_PARALLEL_DOWNLOADS):
     '''
     Try to access a list of articles referenced either by url or by number.
+    The articles are downloaded in parallel (sharing the given session).
     :param numbers_or_urls iterable<str|convertible-to-int>: elements to download
     :param article_format ArticleFormat: Format in which to download the article.
+    :param max_workers int: number of articles to download at the same time
     :return (list<Article>, list<identifier>): Each article is returned as
         Article object.  Its identifier is set to the article number.  If
         unable to get a number for the article, some other identifier (e.g.
@@ -652,27 +674,18 @@ def get_many_articles(numbers_or_urls, session, article_format):
     '''
     articles = list()
     failures = list()
-    for identifier in numbers_or_urls:
-        content = None
-        unique_identifier = None # may be number or derived from url
-        returned_format = None
-        if is_number(identifier):
-            number = int(identifier)
-            content, returned_format = get_article_by_number(number, session, article_format)
-        else:
-            content = get_article_by_url(identifier)
-            # get unique_identifier
-            url_match = ARTICLE_NUMBER_FROM_URL_RE.match(identifier)
-            if url_match:
-                unique_identifier = url_match.group(1)
+    identifiers = list(numbers_or_urls)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+                lambda identifier: _get_article(identifier, session, article_format),
+                identifiers)
+        for identifier, (content, returned_format) in zip(identifiers, results):
+            # sort outcome of operation depending on success/failure
+            if not content:
+                LOG.warning('Unable to get article {} due to {}'.format(identifier, content))
+                failures.append(identifier)
             else:
-                unique_identifier = 'url_' + re.sub('[^a-zA-Z0-9]', '', identifier)
-        # sort outcome of operation depending on success/failure
-        if not content:
-            LOG.warning('Unable to get article {} due to {}'.format(identifier, content))
-            failures.append(identifier)
-        else:
-            articles.append(Article(identifier, content, returned_format))
+                articles.append(Article(identifier, content, returned_format))
     # return what was fetched
     return articles, failures
 
@@ -714,6 +727,11 @@ def log_in(email_address, password):
     '''
     # create the session that will store cookies etc
     session = requests.session()
+    # keep enough connections alive for parallel downloads (see get_many_articles)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10,
+            pool_maxsize=2 * MAX_PARALLEL_DOWNLOADS, max_retries=3)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
     # get first token
     login_url = BASE_URL + LOGIN_PATH
     login_page = session.get(login_url)
@@ -774,9 +792,12 @@ def _get_config_field(config_section, field, ask_user):
 
 
 
+@functools.lru_cache(maxsize=2)
 def read_login_info_from_file(filepath, ask_user):
     '''
     Extract login information from file.
+    The result (including what the user entered) is cached, so the file is
+    read and the user asked only once per run.
     :param ask_user bool: If true, ask the user for input.
     :return tuple<str, str>: (email, password); each may be None if not in
         config file (or file not found)
@@ -810,13 +831,25 @@ def read_login_info_from_file(filepath, ask_user):
 
 def is_number(str_or_int):
     '''
-    Return True when input is either an integer or a string convertible to an integer.
+    Return True when input is either an integer or a string of decimal digits.
     '''
-    try:
-        value = int(str_or_int)
-        return True
-    except ValueError:
-        return False
+    # Note: isdecimal (unlike isdigit) only accepts characters int() can parse
+    return isinstance(str_or_int, int) or (isinstance(str_or_int, str) and str_or_int.isdecimal())
+
+
+def number_from_url_if_possible(identifier):
+    '''
+    Return the article number if identifier is a url that contains one;
+    otherwise return identifier unchanged.
+    '''
+    if not is_number(identifier):
+        url_match = ARTICLE_NUMBER_FROM_URL_RE.match(identifier)
+        if url_match:
+            number = url_match.group(1)
+            LOG.debug('Substituting recognized url "{}" through number {}'.format(
+                identifier, number))
+            return number
+    return identifier
 
 
 if __name__ == '__main__':
@@ -858,8 +891,8 @@ if __name__ == '__main__':
     out_path = os.path.expanduser(args.outputfile)
     config_path = os.path.expanduser(args.config)
 
-    # check, whether out_path contains a pattern
-    if not OUT_PATTERN_RE.match(out_path):
+    # check, whether out_path contains a pattern (the default one does)
+    if args.outputfile != DEFAULT_OUT_NAME and not OUT_PATTERN_RE.match(out_path):
         LOG.warning('The output file pattern should contain a place holder '\
                 'for the article number; see --help.  If you download '\
                 'multiple files, this is a bad idea.')
@@ -867,6 +900,7 @@ if __name__ == '__main__':
     # interpret identifier
     identifiers_to_get = set() # this will be all the elements to download
     session_latest_article = (None, None) # if a login was necessary, store session and latest article
+    logged_in = False # whether session and latest article are both available
 
     for identifier in args.identifiers:
         LOG.debug('Going to interpret identifier {}'.format(identifier))
@@ -879,13 +913,14 @@ if __name__ == '__main__':
             number_end =    max(max(numberA, numberB), 1) # larger number; make sure >= 1
             LOG.debug('Going to add the range from {} to {} to articles to get.'.format(
                 number_begin, number_end))
-            identifiers_to_get = identifiers_to_get.union(set(range(number_begin, number_end+1)))
+            identifiers_to_get.update(range(number_begin, number_end+1))
         # command latest
         elif identifier == 'latest':
             if session_latest_article[1] is None: # check, if information is available
                 email, password = read_login_info_from_file(config_path, True)
                 session_latest_article = log_in(email, password)
-            if any(el is None for el in session_latest_article):
+                logged_in = None not in session_latest_article
+            if not logged_in:
                 LOG.error('Unable to log in.  Skipping {}.'.format(identifier))
                 continue
             identifiers_to_get.add(session_latest_article[1])
@@ -895,7 +930,8 @@ if __name__ == '__main__':
             if session_latest_article[1] is None: # check, if information is available
                 email, password = read_login_info_from_file(config_path, True)
                 session_latest_article = log_in(email, password)
-            if any(el is None for el in session_latest_article):
+                logged_in = None not in session_latest_article
+            if not logged_in:
                 LOG.error('Unable to log in.  Skipping {}.'.format(identifier))
                 continue
             # add all from first to latest without invalid or known ones
@@ -904,12 +940,12 @@ if __name__ == '__main__':
             try:
                 known = read_known_numbers_from_config(config_path,
                         CONFIG_FILE_SECTION_ARTICLES, CONFIG_FILE_KEY_KNOWN)
-                to_get = to_get.difference(known)
+                to_get.difference_update(known)
             except ValueError as e:
                 LOG.info('Unable to get all information about known/invalid '\
                         'articles from config file: {}'.format(e))
             # finally add those to the list to get
-            identifiers_to_get = identifiers_to_get.union(to_get)
+            identifiers_to_get.update(to_get)
         # default: url
         else:
             # unable to interpret identifier as command; add it as identifier
@@ -924,7 +960,7 @@ if __name__ == '__main__':
         if invalid.intersection(identifiers_to_get):
             LOG.info('The following article numbers are probably invalid: {}; '\
                     'removing them from the query'.format(invalid))
-            identifiers_to_get = identifiers_to_get.difference(invalid)
+            identifiers_to_get.difference_update(invalid)
     except ValueError as e:
         LOG.info('Unable to get all information about known/invalid '\
                 'articles from config file: {}'.format(e))
@@ -932,24 +968,15 @@ if __name__ == '__main__':
     # if any number is requested...
     if any(is_number(val) for val in identifiers_to_get):
         # ... make sure that a login is/was performed
-        if any(el is None for el in session_latest_article):
+        if not logged_in:
             email, password = read_login_info_from_file(config_path, True)
             session_latest_article = log_in(email, password)
+            logged_in = None not in session_latest_article
         # ... and substitute urls through their numbers if possible
-        substitutions = list() # tupes (from, to)
-        for identifier in identifiers_to_get:
-            if not is_number(identifier):
-                url_match = ARTICLE_NUMBER_FROM_URL_RE.match(identifier)
-                if url_match:
-                    number = url_match.group(1)
-                    LOG.debug('Substituting recognized url "{}" through number {}'.format(
-                        identifier, number))
-                    substitutions.append((identifier, number))
-        for substitute in substitutions:
-            identifiers_to_get.remove(substitute[0])
-            identifiers_to_get.add(substitute[1])
-
-    if any(el is None for el in session_latest_article):
+        identifiers_to_get = {number_from_url_if_possible(identifier)
+                for identifier in identifiers_to_get}
+
+    if not logged_in:
         LOG.error('Unable to log in.')
 
     # this is what should get fetched
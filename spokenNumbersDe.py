@@ -3,6 +3,7 @@
 '''Spell (German) numbers.'''
 
 import re
+import sys
 import math
 import unittest
 
@@ -63,6 +64,10 @@ class Number():
             90: 'neunzig',
             }
 
+    # PRIMITIVES and TENS as tuples indexed by the number (None if not a key)
+    _PRIMITIVES_T = tuple(map(PRIMITIVES.get, range(20)))
+    _TENS_T = tuple(map(TENS.get, range(100)))
+
     POWERS = {
             10: 'zehn',
             100: 'hundert',
@@ -70,18 +75,18 @@ class Number():
             1000000: 'millionen',
             }
 
+    # powers of ten, indexed by the exponent
+    _POW10 = tuple(10**i for i in range(13))
+
     @staticmethod
     def _get_power(number, power):
         '''Return decimal position denoted by power (e.g. 3 from 2315 for power=2).'''
-        return (number // (10**power)) % 10
+        return (number // Number._POW10[power]) % 10
 
     @staticmethod
     def _get_some_powers(number, smallest_power, number_decimals=3):
         '''Return the three (default, adjust with number_decimals) decimal numbers to the given power and two higher ones.'''
-        digits = 0
-        for i in range(number_decimals):
-            digits += Number._get_power(number, smallest_power + i) * 10**i
-        return digits
+        return (number // Number._POW10[smallest_power]) % Number._POW10[number_decimals]
 
     def _get_max_power(number):
         '''Get highest power necessary to parse number (e.g. 4 for 31013).'''
@@ -90,36 +95,39 @@ class Number():
     @staticmethod
     def _spell_regular(number):
         '''Spell the given number that is formed 'regularly'.'''
-        try:
-            return Number.PRIMITIVES[number]
-        except KeyError:
-            try:
-                return Number.TENS[number]
-            except KeyError:
-                if number < 20:
-                    return Number._spell_regular(Number._get_power(number, 0)) + Number.TENS[10]
-                elif number < 100:
-                    return Number._spell_regular(Number._get_power(number, 0)) + 'und' + \
-                            Number.TENS[10 * Number._get_power(number, 1)]
+        if number < 20:
+            spelled = Number._PRIMITIVES_T[number]
+            if spelled is None:
+                spelled = Number._spell_regular(Number._get_power(number, 0)) + Number.TENS[10]
+            return spelled
+        elif number < 100:
+            spelled = Number._TENS_T[number]
+            if spelled is None:
+                ones = Number._get_power(number, 0)
+                spelled = Number._spell_regular(ones) + 'und' + Number._TENS_T[number - ones]
+            return spelled
+        else:
+            millionen = Number._get_some_powers(number, 6)
+            tausender = Number._get_some_powers(number, 3)
+            hunderter = Number._get_power(number, 2)
+            rest = Number._get_some_powers(number, 0, 2)
+            #print('large number decomposed to {}, {}, {}, {}'.format(millionen, tausender, hunderter, rest))
+            parts = []
+            if millionen:
+                if millionen == 1:
+                    parts.append('einemillion')
                 else:
-                    millionen = Number._get_some_powers(number, 6)
-                    tausender = Number._get_some_powers(number, 3)
-                    hunderter = Number._get_power(number, 2)
-                    rest = Number._get_some_powers(number, 0, 2)
-                    #print('large number decomposed to {}, {}, {}, {}'.format(millionen, tausender, hunderter, rest))
-                    string = ''
-                    if millionen:
-                        if millionen == 1:
-                            string += 'einemillion'
-                        else:
-                            string += Number._spell_regular(millionen) + Number.POWERS[1000000]
-                    if tausender:
-                        string += Number._spell_regular(tausender) + Number.POWERS[1000]
-                    if hunderter:
-                        string += Number._spell_regular(hunderter) + Number.POWERS[100]
-                    if rest:
-                        string += Number._spell(rest)
-                    return string
+                    parts.append(Number._spell_regular(millionen))
+                    parts.append(Number.POWERS[1000000])
+            if tausender:
+                parts.append(Number._spell_regular(tausender))
+                parts.append(Number.POWERS[1000])
+            if hunderter:
+                parts.append(Number._spell_regular(hunderter))
+                parts.append(Number.POWERS[100])
+            if rest:
+                parts.append(Number._spell(rest))
+            return ''.join(parts)
 
 
 
@@ -128,13 +136,8 @@ class Number():
         try:
             return Number.EXCEPTIONS_ORDINALS[number]
         except KeyError:
-            spelled = Number._spell(number)
-            ending = None
-            if number < 20:
-                ending = 'te'
-            else:
-                ending = 'ste'
-            return spelled + ending
+            ending = 'te' if number < 20 else 'ste'
+            return Number._spell(number) + ending
 
 
     @staticmethod
@@ -164,12 +167,17 @@ class Text():
         '''Initialize text with a string.'''
         self._string = string
 
-    NUMBER_RE = re.compile(r'([0-9]+)(,[0-9]+)?')
+    # a run of digits; possessive (no backtracking) if python supports it (>= 3.11)
+    _DIGITS = r'[0-9]++' if sys.version_info >= (3, 11) else r'[0-9]+'
+
+    DIGIT_RE = re.compile(r'[0-9]', re.ASCII)
+    NUMBER_RE = re.compile(r'({0})(,{0})?'.format(_DIGITS), re.ASCII)
     # ordinals must be followed by non-noun (minuscule); otherwise they might
     # get confused with end-of-sentence
-    ORDINAL_RE = re.compile(r'([0-9]+)\.( +[a-z])')
-    ORDINALS_MONTH_RE = re.compile(r'([0-9]+)\. +(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez)')
-    UNITS_RE = re.compile(r'([0-9]+),([0-9]{2}) (Euro|Meter)')
+    ORDINAL_RE = re.compile(r'({0})\.( +[a-z])'.format(_DIGITS), re.ASCII)
+    ORDINALS_MONTH_RE = re.compile(r'({0})\. +(Jan|Feb|Mär|Apr|Mai|Jun|Jul|Aug|Sep|Okt|Nov|Dez)'.format(_DIGITS), re.ASCII)
+    UNITS_RE = re.compile(r'({0}),([0-9]{{2}}) (Euro|Meter)'.format(_DIGITS), re.ASCII)
+    # Note: no re.ASCII here -- \s should still match e.g. non-breaking spaces
     SPLIT_NUMBERS_RE = re.compile(r'([0-9])\s+([0-9]{3})')
 
     @staticmethod
@@ -211,6 +219,9 @@ class Text():
         '''Substitute the numbers in the stored string to their textual
         representation, return a string with substituted numbers.'''
         string = self._string
+        # nothing to do for text without numbers (e.g. most paragraphs)
+        if not Text.DIGIT_RE.search(string):
+            return string
         # remove spaces between numbers
         string = Text.SPLIT_NUMBERS_RE.sub(Text._remove_space, string)
         # first, substitute units
@@ -244,6 +255,10 @@ class TestTextMethods(unittest.TestCase):
     def test_numbers(self):
         self.compare('foo 13 bar', 'foo dreizehn bar')
 
+    def test_no_numbers(self):
+        self.compare('foo bar', 'foo bar')
+        self.compare('', '')
+
     def test_units(self):
         self.compare('foo 13,60 Euro bar', 'foo dreizehn Euro sechzig bar')
         self.compare('foo 13,60 Meter bar', 'foo dreizehn Meter sechzig bar')
@@ -11,11 +11,24 @@ import re
 import argparse
 import os.path
 import os
-import subprocess
+import zipfile
 import logging
 import shutil
+import tempfile
 import glob
+import itertools
+import functools
+import concurrent.futures
+import importlib.util
 from difflib import SequenceMatcher as SM
+try:
+    # much faster fuzzy matching; fall back to difflib if not installed
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
+# process.cdist additionally requires numpy
+HAS_CDIST = process is not None and importlib.util.find_spec('numpy') is not None
 
 
 
@@ -81,6 +94,73 @@ RESORTS_BLACKLIST = [
 RESORT_BLACKLIST_MATCH_TRESHOLD = 0.8
 
 
+# namespaces used in the xpaths below
+# This is actually documented in the element tree api, see
+# https://docs.python.org/2/library/xml.etree.elementtree.html#parsing-xml-with-namespaces
+# Without this, every html element would have to be prefixed with the
+# namespace-url, e.g.
+#   root.findall('.//{http://www.w3.org/1999/xhtml}div')
+NAMESPACES = {'html': 'http://www.w3.org/1999/xhtml'}
+
+# resort in the raw text of an article file; see Article.OVERVIEW_RESORT_RE
+RAW_OVERVIEW_RESORT_RE = re.compile(r'>\[Übersicht ([^\]<]+)\]<')
+
+# number of article files to write at the same time
+MAX_PARALLEL_WRITES = 8
+
+# names of the article files in the epub's OEBPS directory
+ARTICLE_FILE_RE = re.compile(r'article_(\d+)\.xhtml$')
+
+# parser for the article files
+# lxml parses in C (there is no need for something like cElementTree); not
+# collecting the xml ids saves building a hash table that is never used.
+XHTML_PARSER = etree.XMLParser(collect_ids=False)
+
+# compiled xpaths to find the parts of an article in an xhtml file
+# the containers of the article's parts; the xpaths further below are relative
+# to them so that the whole document only needs to be searched once per
+# container
+XP_ARTICLE_TITLES = etree.XPath('.//html:div[@class="article_titles"]', namespaces=NAMESPACES)
+XP_ARTICLE_TEXT = etree.XPath('.//html:div[@class="article_text"]', namespaces=NAMESPACES)
+XP_HEAD_TITLE = etree.XPath('.//html:head/html:title', namespaces=NAMESPACES)
+XP_NAVIGATION_LINKS = etree.XPath('.//html:div[@class="article_navigation"]//html:span[@class="link"]', namespaces=NAMESPACES)
+XP_BOXES = etree.XPath('.//html:div[@class="group"]/html:div[@class="additional-content"]/html:div[@class="x-zeit-box"]', namespaces=NAMESPACES)
+# relative to div[@class="article_titles"]
+XP_TITLE = etree.XPath('./html:h1[@class="title"]', namespaces=NAMESPACES)
+XP_SUPERTITLE = etree.XPath('./html:h3[@class="supertitle"]', namespaces=NAMESPACES)
+XP_SUBTITLE = etree.XPath('./html:h3[@class="subtitle"]', namespaces=NAMESPACES)
+XP_AUTHOR = etree.XPath('./html:span[@class="author"]', namespaces=NAMESPACES)
+# relative to div[@class="article_text"]
+XP_SUBHEADLINE = etree.XPath('.//html:div[@class="subheadline-1 "]', namespaces=NAMESPACES)
+XP_AUTHOR_FALLBACK = etree.XPath('./html:div[@class="group"]/html:div[@class="additional-content"]/html:div[@class="x-zeit-box"]/html:p[@class="paragraph style-3"]', namespaces=NAMESPACES)
+# see the Note on content in Article.parse
+XP_PARAGRAPHS = etree.XPath('.//html:p[not(ancestor::html:div[@class="x-zeit-box"])]', namespaces=NAMESPACES)
+XP_AUDIO_LINKS = etree.XPath('.//html:a[@class="x-zeit-link-box"]', namespaces=NAMESPACES)
+# relative to a box or link found by the ones above
+XP_BOX_HEADLINE = etree.XPath('.//html:p[@class="h3"]', namespaces=NAMESPACES)
+XP_BOX_PARAGRAPHS = etree.XPath('./html:p', namespaces=NAMESPACES)
+XP_LINK_DESCRIPTION = etree.XPath('./html:span', namespaces=NAMESPACES)
+
+
+def _first(elements):
+    '''Return the first of the found elements or None if there is none.'''
+    return elements[0] if elements else None
+
+
+def _first_in(containers, xpath):
+    '''Return the first element found by xpath in any of the containers or None.'''
+    for container in containers:
+        found = xpath(container)
+        if found:
+            return found[0]
+    return None
+
+
+def _all_in(containers, xpath):
+    '''Return all elements found by xpath in the containers (in document order).'''
+    return [element for container in containers for element in xpath(container)]
+
+
 class Article():
     '''Class to parse/process one article.'''
 
@@ -108,53 +188,45 @@ class Article():
 
     def parse(self, xhtml_file_name):
         '''Parse one article from one xhtml file.'''
-        logging.debug('Processing file {}'.format(xhtml_file_name))
-        tree = etree.parse(xhtml_file_name)
+        logging.debug('Processing file %s', xhtml_file_name)
+        tree = etree.parse(xhtml_file_name, XHTML_PARSER)
         root = tree.getroot()
+        titles = XP_ARTICLE_TITLES(root)
+        texts = XP_ARTICLE_TEXT(root)
 
-        # generate a namespaces dictionary
-        # Without this, every html element would have to be prefixed with the
-        # namespace-url, e.g.
-        #   root.findall('.//{http://www.w3.org/1999/xhtml}div')
-        # findall accepts a second argument, which is a dictionary with
-        # namespaces shorthands.
-        # This is actually documented in the element tree api, see
-        # https://docs.python.org/2/library/xml.etree.elementtree.html#parsing-xml-with-namespaces
-        namespaces = {'html': 'http://www.w3.org/1999/xhtml'}
-
-        # Note: When checking whether a find() call found something, you _need_
+        # Note: When checking whether _first() found something, you _need_
         #       to compare the result to None.  Findings that have no children
         #       evaluate to False.  See
         #       https://stackoverflow.com/questions/20129996
 
         # title
-        title = root.find('.//html:div[@class="article_titles"]/html:h1[@class="title"]', namespaces)
+        title = _first_in(titles, XP_TITLE)
         if title is not None and title.text is not None:
             self._title = title.text
         else:
             # search for a supertitle
-            supertitle = root.find('.//html:div[@class="article_titles"]/html:h3[@class="supertitle"]', namespaces)
+            supertitle = _first_in(titles, XP_SUPERTITLE)
             if supertitle is not None and supertitle.text is not None:
-                logging.debug('Using supertitle as title in file {}'.format(xhtml_file_name))
+                logging.debug('Using supertitle as title in file %s', xhtml_file_name)
                 self._title = supertitle.text
             else:
                 # search for a subheadline
-                subheadline = root.find('.//html:div[@class="article_text"]//html:div[@class="subheadline-1 "]', namespaces)
+                subheadline = _first_in(texts, XP_SUBHEADLINE)
                 if subheadline is not None and subheadline.text is not None:
-                    logging.debug('Using subheadline as title in file {}'.format(xhtml_file_name))
+                    logging.debug('Using subheadline as title in file %s', xhtml_file_name)
                     self._title = subheadline.text
                 else:
                     # look for <title> in <head>
-                    title_head = root.find('.//html:head/html:title', namespaces)
+                    title_head = _first(XP_HEAD_TITLE(root))
                     if title_head is not None and title_head.text is not None:
-                        logging.debug('Using title from head as title in file {}'.format(xhtml_file_name))
+                        logging.debug('Using title from head as title in file %s', xhtml_file_name)
                         self._title = title_head.text
                     else:
                         self._title = Article.DEFAULT_TITLE
-                        logging.info('File {} has neither title, nor supertitle nor subheadline, using default title "{}"'.format(xhtml_file_name, self._title))
+                        logging.info('File %s has neither title, nor supertitle nor subheadline, using default title "%s"', xhtml_file_name, self._title)
 
         # subtitle
-        subtitle = root.find('.//html:div[@class="article_titles"]/html:h3[@class="subtitle"]', namespaces)
+        subtitle = _first_in(titles, XP_SUBTITLE)
         if subtitle is not None and subtitle.text is not None:
             self._subtitle = subtitle.text.strip()
             # force trailing period
@@ -162,30 +234,31 @@ class Article():
                 self._subtitle += '.'
         else:
             self._subtitle = ''
-            logging.debug('Article in file {} does not have a subtitle.'.format(
-                xhtml_file_name))
+            logging.debug('Article in file %s does not have a subtitle.', xhtml_file_name)
 
         # author
-        author = root.find('.//html:div[@class="article_titles"]/html:span[@class="author"]', namespaces)
+        author = _first_in(titles, XP_AUTHOR)
         author_text = None # will be converted later
         if author is not None and author.text is not None:
             author_text = author.text
         else:
-            author = root.find('.//html:div[@class="article_text"]/html:div[@class="group"]/html:div[@class="additional-content"]/html:div[@class="x-zeit-box"]/html:p[@class="paragraph style-3"]', namespaces)
+            author = _first_in(texts, XP_AUTHOR_FALLBACK)
             if author is not None and author.text is not None:
                 author_text = author.text
             else:
                 author_text = ''
                 # sometimes, the author is hidden in the subtitle (in capital case)
                 if self._subtitle:
-                    name = re.findall('([A-Z]{2,})', self._subtitle)
+                    name = Article.CAPITAL_WORD_RE.findall(self._subtitle)
                     author_text = ' '.join(name)
         if not author_text: # unable to find an author
-            logging.debug('Article in file {} does not have an author.'.format(xhtml_file_name))
-        self._author = ' '.join(map(Article._capitalize_names, author_text.lower().split(' ')))
+            logging.debug('Article in file %s does not have an author.', xhtml_file_name)
+        # capitalize the words that may belong to a name
+        self._author = ' '.join(word if word in Article.LOWERCASE_NAME_PARTS else word.capitalize()
+                for word in author_text.lower().split(' '))
 
         # resort
-        for link in root.findall('.//html:div[@class="article_navigation"]//html:span[@class="link"]', namespaces):
+        for link in XP_NAVIGATION_LINKS(root):
             match = Article.OVERVIEW_RESORT_RE.match(link.text)
             if match:
                 self._resort = match.group(1)
@@ -205,37 +278,30 @@ class Article():
         #       This is not supported by ElementTree, due to
         #           SyntaxError: prefix 'ancestor' not found in prefix map
         #       lxml supports this, though, using the xpath() method.
-        self._content = list()
-        for paragraph in root.xpath(
-                './/html:div[@class="article_text"]//html:p[not(ancestor::html:div[@class="x-zeit-box"])]',
-                namespaces=namespaces):
-            text = ''.join(paragraph.itertext())
-            # skip empty paragraphs (links etc):
-            if text:
-                self._content.append(text)
+        # skip empty paragraphs (links etc)
+        self._content = [text for text in
+                (''.join(paragraph.itertext()) for paragraph in _all_in(texts, XP_PARAGRAPHS))
+                if text]
 
         # contents 'Hinter der Geschichte'
         # some of the x-zeit-box'es are interesting, though -- the ones that
         # include "Hinter der Geschichte".  Look for those additionally and
         # append that to the content.
-        for box in root.findall('.//html:div[@class="group"]/html:div[@class="additional-content"]/html:div[@class="x-zeit-box"]', namespaces):
-            headline = box.find('.//html:p[@class="h3"]', namespaces)
+        for box in XP_BOXES(root):
+            headline = _first(XP_BOX_HEADLINE(box))
             if headline is not None and headline.text is not None and "Hinter der Geschichte" in headline.text:
-                hinter_der_geschichte = []
-                for paragraph in box.findall('./html:p', namespaces):
-                    text = ''.join(paragraph.itertext())
-                    if text:
-                        hinter_der_geschichte.append(text)
-                self._content += hinter_der_geschichte
+                self._content.extend(text for text in
+                        (''.join(paragraph.itertext()) for paragraph in XP_BOX_PARAGRAPHS(box))
+                        if text)
 
         # has audio
         # by default, assume that there is no audio; only if there is a link
             # with the appropriate content, this is assumed to have audio
         self._hasaudio = False
-        for link in root.findall('.//html:div[@class="article_text"]//html:a[@class="x-zeit-link-box"]', namespaces):
+        for link in _all_in(texts, XP_AUDIO_LINKS):
             # check that link is an audio link
             target = link.attrib['href']
-            description = link.find('./html:span', namespaces)
+            description = _first(XP_LINK_DESCRIPTION(link))
             if description is not None and description.text is not None:
                 if 'vorgelesen' in description.text and 'zeit.de/misc_static_files' in target:
                     self._hasaudio = True
@@ -305,7 +371,7 @@ class Article():
             audio=self._hasaudio,
             number=self._order_number)
         if subs_spaces is not None:
-            formatted_string = re.sub(' ', subs_spaces, formatted_string)
+            formatted_string = formatted_string.replace(' ', subs_spaces)
         if asciify:
             formatted_string = Article._remove_non_ascii(formatted_string)
         return formatted_string
@@ -326,15 +392,7 @@ class Article():
         Return a string with all non-ascii characters substituted removed.
         :param str missing: set this to any string that is used for unknown characters.
         '''
-
-        def ascii_variant(match):
-            '''Return an alternative representation if possible.'''
-            try:
-                return Article.UMLAUTS_TRANSLATION[match.group(0)]
-            except KeyError:
-                return ''
-
-        return re.sub(r'[^a-zA-Z0-9_.-]', ascii_variant, string)
+        return Article.NON_ASCII_RE.sub('', string.translate(Article.UMLAUTS_TABLE))
 
 
     UMLAUTS_TRANSLATION = { u'ä': 'ae',
@@ -345,6 +403,11 @@ class Article():
                             u'Ü': 'Ue',
                             u'ß': 'ss' }
 
+    # to be used with str.translate
+    UMLAUTS_TABLE = str.maketrans(UMLAUTS_TRANSLATION)
+
+    NON_ASCII_RE = re.compile(r'[^a-zA-Z0-9_.-]')
+
 
 
     def spell_numbers(self):
@@ -355,22 +418,19 @@ class Article():
             self._content[i] = spokenNumbersDe.spell_numbers(self._content[i])
 
 
-    def plain_text(self):
-        '''Return article in plain Text without markup.'''
-        return '\n\n'.join([
-            self._resort,
-            self._title,
-            self._subtitle,
-            self._author] + self._content)
+    def write_to(self, f):
+        '''Write the article in plain text without markup (parts separated by empty lines) to the file f.'''
+        f.write(self._resort)
+        for part in (self._title, self._subtitle, self._author):
+            f.write('\n\n')
+            f.write(part)
+        for paragraph in self._content:
+            f.write('\n\n')
+            f.write(paragraph)
 
 
-    @staticmethod
-    def _capitalize_names(word):
-        '''Return the word capitalized, if it may belong to a name.'''
-        if word in ['von']:
-            return word
-        else:
-            return word.capitalize()
+    # words in (author) names that are not capitalized
+    LOWERCASE_NAME_PARTS = frozenset(['von'])
 
 
     def __str__(self):
@@ -382,6 +442,9 @@ class Article():
 
     OVERVIEW_RESORT_RE = re.compile(r'\[Übersicht (.+)\]')
 
+    # words in capital case (e.g. author names in the subtitle)
+    CAPITAL_WORD_RE = re.compile(r'[A-Z]{2,}')
+
 
 
 class Newspaper():
@@ -397,9 +460,7 @@ class Newspaper():
         self.resorts = {}
 
     def append(self, article):
-        if not article.get_resort() in self.resorts:
-            self.resorts.update({article.get_resort(): list()})
-        self.resorts[article.get_resort()].append(article)
+        self.resorts.setdefault(article.get_resort(), list()).append(article)
 
     def get_resorts(self):
         '''Return list of all resorts.'''
@@ -417,30 +478,71 @@ class Newspaper():
         '''
         counter = 1
         numbered_res = set()
-        for res in resort_order:
-            resort_found = Newspaper._fuzzy_match(res, self.resorts, match_treshold)
+        for resort_found in self._match_resorts(resort_order, match_treshold):
             if resort_found:
                 numbered_res.add(resort_found)
-                logging.debug('resort {} gets number {}'.format(resort_found, counter))
+                logging.debug('resort %s gets number %s', resort_found, counter)
                 for art in self.resorts[resort_found]:
                     art.set_number(counter)
                 counter += 1
         unnumbered_res = set(self.resorts.keys()).difference(numbered_res)
         if unnumbered_res:
-            logging.warning('These resorts are not numbered: {}'.format(unnumbered_res))
+            logging.warning('These resorts are not numbered: %s', unnumbered_res)
             return unnumbered_res
         else:
             return None
 
+    def _match_resorts(self, resort_order, match_treshold):
+        '''
+        Return a list with the resort that matches each entry of resort_order
+        best or None, if no resort matches above the treshold.
+        '''
+        resorts = list(self.resorts)
+        if HAS_CDIST:
+            # compute all scores at once
+            scores = process.cdist(resort_order, resorts, scorer=fuzz.ratio, workers=-1)
+            return [resorts[row.argmax()] if row.max() > match_treshold * 100 else None
+                    for row in scores]
+        elif process is not None:
+            # rapidfuzz without numpy: same scorer, one row at a time
+            return [Newspaper._extract_one(res, resorts, match_treshold)
+                    for res in resort_order]
+        else:
+            # one matcher per resort, so that each resort is analyzed only once
+            matchers = {resort: SM(None, '', resort) for resort in resorts}
+            return [Newspaper._fuzzy_match(res, matchers, match_treshold)
+                    for res in resort_order]
+
     @staticmethod
-    def _fuzzy_match(pivot, strings, treshold):
+    def _extract_one(pivot, resorts, treshold):
         '''
-        Return the string from strings that matches pivot best.  If no match is
-        found with a fuzzy match above the treshold, return None.
+        Return the resort that matches pivot best (using rapidfuzz) or None,
+        if no resort matches above the treshold.
+        '''
+        best = process.extractOne(pivot, resorts, scorer=fuzz.ratio,
+                score_cutoff=treshold * 100)
+        if best is not None and best[1] > treshold * 100:
+            return best[0]
+        else:
+            return None
+
+    @staticmethod
+    def _fuzzy_match(pivot, matchers, treshold):
+        '''
+        Return the string from matchers that matches pivot best.  If no match
+        is found with a fuzzy match above the treshold, return None.
+
+        :param dict matchers: string -> SequenceMatcher with that string as
+        second sequence.  Setting only the first sequence (to pivot) reuses
+        the analysis of the second one.
         '''
         def get_ratio(x):
-            return SM(None, pivot, x).ratio()
-        candidate = max(strings, key=get_ratio)
+            if x == pivot:
+                return 1.0
+            matcher = matchers[x]
+            matcher.set_seq1(pivot)
+            return matcher.ratio()
+        candidate = max(matchers, key=get_ratio)
         if get_ratio(candidate) > treshold:
             return candidate
         else:
@@ -457,21 +559,86 @@ class Newspaper():
 
 
 
+def fuzzy_ratio(a, b):
+    '''Return the similarity of the strings a and b (1.0 if they are equal).'''
+    if a == b:
+        return 1.0
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100
+    return SM(None, a, b).ratio()
+
+
+
+@functools.lru_cache(maxsize=None)
+def is_blacklisted(resort):
+    '''
+    Return True if the resort (fuzzy) matches one in RESORTS_BLACKLIST.
+    The result is cached since many articles share the same resort.
+    '''
+    return any((fuzzy_ratio(resort, blacklisted) > RESORT_BLACKLIST_MATCH_TRESHOLD) for blacklisted in RESORTS_BLACKLIST)
+
+
+
+def peek_resort(xhtml_file_name):
+    '''
+    Return the resort of the article in the xhtml file without parsing it or
+    None if it cannot be found this way.
+    '''
+    with open(xhtml_file_name, encoding='utf-8', errors='replace') as f:
+        resorts = RAW_OVERVIEW_RESORT_RE.findall(f.read())
+    # like Article.parse, use the last one
+    return resorts[-1] if resorts else None
+
+
+
+def parse_article(article_id, filename, spell_numbers=False, skip_blacklisted=False):
+    '''
+    Parse the article with the given ID from the xhtml file.
+    Return the article or None if the file could not be parsed.
+
+    This is a module level function so that it can be run in a process pool.
+
+    :param bool spell_numbers: Substitute textual numbers by their spelled-out
+    version.
+    :param bool skip_blacklisted: Return None without parsing the file if the
+    article's resort can be found cheaply (see peek_resort) and is blacklisted.
+    '''
+    if skip_blacklisted:
+        resort = peek_resort(filename)
+        if resort is not None and is_blacklisted(resort):
+            logging.info('Skipping article %s of resort %s that is on blacklist', article_id, resort)
+            return None
+    article = Article(article_id)
+    try:
+        article.parse(filename)
+    except etree.ParseError as e:
+        logging.error('xml parse error "%s" in %s; skipping that', str(e), filename)
+        return None
+    if spell_numbers:
+        article.spell_numbers()
+    return article
+
+
+
+def write_article(article, filename):
+    '''Write the article as plain text to the given file.'''
+    with open(filename, 'w') as f:
+        article.write_to(f)
+
+
+
 def make_temp_dir():
     '''
     Create a temporary directory.
     Return directory path or None (in case of an error).
     '''
-    mktemp = subprocess.Popen(['mktemp', '-d'], stdout=subprocess.PIPE)
-    created_dir, errors = mktemp.communicate()
-    created_dir = created_dir.strip().decode('utf-8')
-    if errors:
-        logging.warning('mktemp had error "{}".'.format(errors.strip()))
-    if not os.path.isdir(created_dir):
+    try:
+        created_dir = tempfile.mkdtemp()
+    except OSError as e:
+        logging.warning('unable to create temporary directory: "%s".', e)
         return None
-    else:
-        logging.debug('Created temporary directory {}.'.format(created_dir))
-        return created_dir
+    logging.debug('Created temporary directory %s.', created_dir)
+    return created_dir
 
 
 
@@ -529,7 +696,7 @@ def parse_arguments_and_execute():
         # create it
         try:
             os.makedirs(outdir)
-            logging.info('Created output directory "{}".'.format(outdir))
+            logging.info('Created output directory "%s".', outdir)
         except OSError:
             quit_error('output directory "{}" is invalid; unable to create it.'.format(
                 outdir), ERR_OUT_INVALID)
@@ -543,40 +710,47 @@ def parse_arguments_and_execute():
             quit_error('Unable to create a temporary directory.', ERR_MKTEMP_FAILS)
 
         # unzip epub into that directory
-        # do not view output
-        dev_null = open(os.devnull, 'w')
-        unzip_ret = subprocess.call(['unzip', epub, '-d', created_dir], stdout=dev_null)
-        if unzip_ret not in [0, 1]:
-            quit_error('unzip failed with error code {}'.format(unzip_ret), ERR_UNZIP)
+        try:
+            with zipfile.ZipFile(epub) as epub_zip:
+                epub_zip.extractall(created_dir)
+        except (zipfile.BadZipFile, OSError) as e:
+            quit_error('unzip failed: {}'.format(e), ERR_UNZIP)
         else:
-            logging.debug('Unzipped content of epub to {}.'.format(created_dir))
+            logging.debug('Unzipped content of epub to %s.', created_dir)
 
         # parse each article, add it to a newspaper
         basedir = created_dir + '/OEBPS'
         paper = Newspaper()
-        for resource in os.listdir(basedir):
-            article_file = re.match(r'article_(\d+).xhtml', resource)
-            if article_file:
-                article = Article(int(article_file.group(1)))
-                try:
-                    filename = os.path.join(basedir, resource)
-                    article.parse(filename)
-                except etree.ParseError as e:
-                    logging.error('xml parse error "{}" in {}; skipping that'.format(str(e), filename))
+        article_ids = list()
+        article_files = list()
+        with os.scandir(basedir) as resources:
+            for resource in resources:
+                article_file = ARTICLE_FILE_RE.match(resource.name)
+                if article_file:
+                    article_ids.append(int(article_file.group(1)))
+                    article_files.append(resource.path)
+        # parsing is cpu bound; use all cores
+        # workers that import this module anew (spawn/forkserver) do not know
+        # the log level set on the command line
+        with concurrent.futures.ProcessPoolExecutor(
+                initializer=logging.getLogger().setLevel, initargs=(log_level,)) as executor:
+            parsed_articles = executor.map(parse_article, article_ids, article_files,
+                    itertools.repeat(spell_numbers), itertools.repeat(do_blacklist),
+                    chunksize=16)
+            for article in parsed_articles:
+                if article is None:
                     continue
-                if spell_numbers:
-                    article.spell_numbers()
                 # consider audio articles only if requested
                 if article.has_audio():
                     if get_audio:
-                        logging.info('Using article {} that has audio on zeit.de'.format(article.get_meta()))
+                        logging.info('Using article %s that has audio on zeit.de', article.get_meta())
                     else:
-                        logging.info('Skipping article {} that has audio on zeit.de'.format(article.get_meta()))
+                        logging.info('Skipping article %s that has audio on zeit.de', article.get_meta())
                         continue
-                # skip article if in blacklist
+                # skip article if in blacklist (and not yet skipped by parse_article)
                 if do_blacklist:
-                    if any((SM(None, article.get_resort(), resort).ratio() > RESORT_BLACKLIST_MATCH_TRESHOLD) for resort in RESORTS_BLACKLIST):
-                        logging.info('Skipping article {} that is on blacklist'.format(article.get_meta()))
+                    if is_blacklisted(article.get_resort()):
+                        logging.info('Skipping article %s that is on blacklist', article.get_meta())
                         continue
                 # append article to newspaper
                 paper.append(article)
@@ -585,29 +759,33 @@ def parse_arguments_and_execute():
         if number_output:
             unknown_resorts = paper.number_articles(RESORTS_ORDER, RESORT_ORDER_MATCH_TRESHOLD)
             if unknown_resorts is not None:
-                logging.warning('The following resorts were unknown: {}'.format(unknown_resorts))
+                logging.warning('The following resorts were unknown: %s', unknown_resorts)
 
         # write articles to file
-        for article in paper.articles():
-            try:
+        # writing is io bound; overlap the writes in threads
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_PARALLEL_WRITES) as executor:
+            writes = list()
+            for article in paper.articles():
                 filename = outdir + '/' + article.generate_filename()
-                with open(filename, 'w') as f:
-                    f.write(article.plain_text())
-            except PermissionError:
-                quit_error('Not allowed to write to directory "{}".'.format(outdir), ERR_WRITE_PERM)
-            except OSError as e:
-                logging.warn('Skipping article {} due to {}'.format(article, e))
-            except:
-                import traceback
-                logging.warn('Caught strange exception when writing article {} to file {}'.format(
-                    article, filename))
-                traceback.print_stack()
+                writes.append((article, filename, executor.submit(write_article, article, filename)))
+            for article, filename, write in writes:
+                try:
+                    write.result()
+                except PermissionError:
+                    quit_error('Not allowed to write to directory "{}".'.format(outdir), ERR_WRITE_PERM)
+                except OSError as e:
+                    logging.warning('Skipping article %s due to %s', article, e)
+                except:
+                    import traceback
+                    logging.warning('Caught strange exception when writing article %s to file %s',
+                            article, filename)
+                    traceback.print_exc()
 
         # remove temporary directory
         if keep_temp:
             print('not removing temporary directory "{}".'.format(created_dir))
         else:
-            logging.debug('removing temporary directory "{}".'.format(created_dir))
+            logging.debug('removing temporary directory "%s".', created_dir)
             shutil.rmtree(created_dir)
 
 
@@ -3,22 +3,53 @@ Extract the articles from a "Die Zeit" EPUB in plain text.
 """
 
 import difflib
-import tempfile
+import functools
+import io
 import pathlib
 import re
 import argparse
 import zipfile
 import configparser
-from dataclasses import dataclass, field, asdict
-from typing import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable
 
-from bs4 import BeautifulSoup
+from lxml import etree, html
+
+try:
+    # much faster fuzzy matching; fall back to difflib if not installed
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
 
 
 # API
 
 DEFAULT_CONFIG_FILE_PATH = pathlib.Path("~/.config/zeit_extractor/options.conf").expanduser().absolute()
 
+# The articles are xhtml, but they are deliberately parsed as html: the
+# relevant tags are then found without caring about the xhtml namespace.
+ARTICLE_PARSER = html.HTMLParser(encoding="utf-8")
+
+# number of articles a worker process extracts per task
+ARTICLES_PER_TASK = 8
+# read articles from the epub in large blocks instead of many small reads
+ZIP_READ_BUFFER_SIZE = 64 * 1024
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements with the css class ``name`` (among others)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+XP_TITLE = etree.XPath("string((//title)[1])", smart_strings=False)
+XP_RESSORT_LINK = etree.XPath(f"(//span[{_has_class('link')}])[1]")
+XP_SUBTITLE = etree.XPath(f"(//h3[{_has_class('subtitle')}])[1]")
+XP_ARTICLE_TEXT = etree.XPath(f"(//div[{_has_class('article_text')}])[1]")
+XP_BLOCKQUOTES = etree.XPath(".//blockquote")
+XP_PARAGRAPHS = etree.XPath(f".//p[{_has_class('paragraph')}]")
+
 
 @dataclass(frozen=True)
 class Article:
@@ -29,36 +60,37 @@ class Article:
     content: str
 
 
-def extract_article(xhtml_file_path: pathlib.Path) -> Article:
-    """Extract a single article from its xhtml file."""
-    with open(xhtml_file_path, "r") as xhtml_file:
-        soup = BeautifulSoup(xhtml_file, "html.parser")
-        title = soup.title.text
-        return Article(
-            title=title,
-            ressort=_find_ressort(soup),
-            content=_find_content(soup),
-        )
+def extract_article(xhtml_file: pathlib.Path | BinaryIO) -> Article:
+    """Extract a single article from its xhtml file (given as path or opened in binary mode)."""
+    if isinstance(xhtml_file, pathlib.Path):
+        with open(xhtml_file, "rb") as opened_xhtml_file:
+            return extract_article(opened_xhtml_file)
+    root = html.parse(xhtml_file, ARTICLE_PARSER).getroot()
+    return Article(
+        title=XP_TITLE(root),
+        ressort=_find_ressort(root),
+        content=_find_content(root),
+    )
 
 
 def extract_articles(epub_file_path: pathlib.Path) -> list[Article]:
     """Extract all articles from an epub file."""
-    articles: list[Article] = []
-    with tempfile.TemporaryDirectory() as unzip_folder:
-        articles_files = _extract_epub(epub_file_path, pathlib.Path(unzip_folder))
-        for article_file in articles_files:
-            articles.append(extract_article(article_file))
-    return articles
+    with zipfile.ZipFile(epub_file_path, "r") as epub_file:
+        article_names = _find_article_names(epub_file)
+    # parsing is cpu bound and the articles are independent of each other;
+    # each worker reads its chunk of articles directly from the epub
+    chunks = [
+        article_names[start : start + ARTICLES_PER_TASK] for start in range(0, len(article_names), ARTICLES_PER_TASK)
+    ]
+    with ProcessPoolExecutor() as executor:
+        extracted_chunks = executor.map(functools.partial(_extract_articles_from_epub, epub_file_path), chunks)
+        return [article for extracted_chunk in extracted_chunks for article in extracted_chunk]
 
 
 def write_article_to_file(article: Article, file_path: pathlib.Path):
     """Write a single article to a (plain) text file (UTF-8 with a BOM)."""
     with open(file_path, "w", encoding="utf-8-sig") as article_file:
-        print(article.ressort, file=article_file)
-        print("", file=article_file)
-        print(article.title, file=article_file)
-        print("", file=article_file)
-        print(article.content, file=article_file)
+        article_file.write(f"{article.ressort}\n\n{article.title}\n\n{article.content}\n")
 
 
 @dataclass
@@ -114,32 +146,91 @@ class StorageOptions:
 def load_options_from_config_file(
     path_to_config_file: pathlib.Path = DEFAULT_CONFIG_FILE_PATH,
 ) -> StorageOptions:
-    """Load ``StorageOptions`` from a file following configparser syntax."""
-    parser = configparser.ConfigParser()
+    """
+    Load ``StorageOptions`` from a file following configparser syntax.
+    Each file is only read once; later calls return new options with the cached values.
+    """
     if isinstance(path_to_config_file, str):
         path_to_config_file = pathlib.Path(path_to_config_file)
-    path_to_config_file = path_to_config_file.expanduser()
+    resorts_to_store_order, ressort_blacklist, filename_pattern = _read_storage_options(
+        path_to_config_file.expanduser().resolve()
+    )
+    return StorageOptions(
+        resorts_to_store_order=list(resorts_to_store_order),
+        ressort_blacklist=set(ressort_blacklist),
+        filename_pattern=filename_pattern,
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _read_storage_options(path_to_config_file: pathlib.Path) -> tuple[tuple[str, ...], frozenset[str], str]:
+    """Read the raw values of the ``StorageOptions`` from a config file."""
+    parser = configparser.ConfigParser()
     print(f"Reading configuration from '{path_to_config_file}'.")
     parser.read(path_to_config_file)
     storage_options = parser["storage options"]
-    options = StorageOptions(
-        resorts_to_store_order=storage_options.get("resorts_to_store_order").split("\n"),
-        ressort_blacklist=set(storage_options.get("ressort_blacklist").split("\n")),
-        filename_pattern=storage_options.get("filename_pattern"),
+    return (
+        tuple(storage_options.get("resorts_to_store_order").split("\n")),
+        frozenset(storage_options.get("ressort_blacklist").split("\n")),
+        storage_options.get("filename_pattern"),
     )
-    return options
 
 
-def _is_ressort_contained(ressort: str, ressorts: Iterable[str]) -> bool:
-    return _index_of_ressort(ressort, ressorts) is not None
+def _normalize_ressort(ressort: str) -> str:
+    """Reduce a ressort name to its case-folded letters, e.g. ``ZEIT magazin`` to ``zeitmagazin``."""
+    return "".join(character for character in ressort.casefold() if character.isalpha())
 
 
-def _index_of_ressort(ressort: str, ressorts: Iterable[str]) -> int | None:
+def _make_ressort_lookup(ressorts: Iterable[str]) -> dict[str, int]:
+    """Map the normalized names of ``ressorts`` to their (first) position."""
+    lookup: dict[str, int] = {}
+    for index, ressort in enumerate(ressorts):
+        lookup.setdefault(_normalize_ressort(ressort), index)
+    return lookup
+
+
+def _is_ressort_contained(
+    ressort: str,
+    ressorts: Iterable[str],
+    normalized_ressorts: frozenset[str] | None = None,
+) -> bool:
+    """
+    Check fuzzy, whether the given ressort is one of ``ressorts``.
+    :param normalized_ressorts: the ``_normalize_ressort``-ed ``ressorts``; pass
+        them when checking many ressorts against the same ``ressorts``.
+    """
+    if normalized_ressorts is None:
+        normalized_ressorts = frozenset(map(_normalize_ressort, ressorts))
+    if _normalize_ressort(ressort) in normalized_ressorts:
+        return True
+    return _fuzzy_index_of_ressort(ressort, ressorts) is not None
+
+
+def _index_of_ressort(
+    ressort: str,
+    ressorts: Iterable[str],
+    ressort_lookup: dict[str, int] | None = None,
+) -> int | None:
     """
     Return the position of the given resort in an iterable of ressorts.
     The check is performed fuzzy to match e.g. ``POLITIK`` and ``Politik``.
     Return the matching index or ``None`` if unable to find a match.
+    :param ressort_lookup: result of ``_make_ressort_lookup(ressorts)``; pass it
+        when checking many ressorts against the same ``ressorts``.
     """
+    if ressort_lookup is None:
+        ressort_lookup = _make_ressort_lookup(ressorts)
+    if (index := ressort_lookup.get(_normalize_ressort(ressort))) is not None:
+        return index
+    return _fuzzy_index_of_ressort(ressort, ressorts)
+
+
+def _fuzzy_index_of_ressort(ressort: str, ressorts: Iterable[str]) -> int | None:
+    if process is not None:
+        match = process.extractOne(
+            ressort.lower(), [possible_match.lower() for possible_match in ressorts], scorer=fuzz.ratio
+        )
+        return match[2] if match is not None and match[1] > 80 else None
 
     def ignore_nonalpha(character: str) -> bool:
         return not character.isalpha()
@@ -173,11 +264,22 @@ def store_articles(
     """
     unmatched_ressorts: set[str] = set()
     stored_articles: list[StoredArticle] = []
+    normalized_blacklist = frozenset(map(_normalize_ressort, storage_options.ressort_blacklist))
+    order_lookup = _make_ressort_lookup(storage_options.resorts_to_store_order)
+
+    # an issue has far more articles than ressorts; classify each ressort once
+    @functools.lru_cache(maxsize=None)
+    def classify(ressort_lower: str) -> tuple[bool, int | None]:
+        """Return whether the ressort is blacklisted and its index in the store order."""
+        if _is_ressort_contained(ressort_lower, storage_options.ressort_blacklist, normalized_blacklist):
+            return True, None
+        return False, _index_of_ressort(ressort_lower, storage_options.resorts_to_store_order, order_lookup)
+
     for article in articles:
-        if _is_ressort_contained(article.ressort, storage_options.ressort_blacklist):
+        is_blacklisted, ressort_index = classify(article.ressort.lower())
+        if is_blacklisted:
             continue
 
-        ressort_index = _index_of_ressort(article.ressort, storage_options.resorts_to_store_order)
         if ressort_index is None:
             ressort_index = len(storage_options.resorts_to_store_order)
             unmatched_ressorts.add(article.ressort)
@@ -192,7 +294,14 @@ def store_articles(
             print(f"Warning: {output_file_path} already exists.")
 
         write_article_to_file(article, output_file_path)
-        stored_articles.append(StoredArticle(**asdict(article), path=output_file_path))
+        stored_articles.append(
+            StoredArticle(
+                title=article.title,
+                ressort=article.ressort,
+                content=article.content,
+                path=output_file_path,
+            )
+        )
 
     return unmatched_ressorts, stored_articles
 
@@ -200,55 +309,68 @@ def store_articles(
 # Helper
 
 
-def _find_ressort(article: BeautifulSoup) -> str:
+def _find_ressort(article: html.HtmlElement) -> str:
     # typically it's the first <span class=link>
-    span = article.find("span", {"class": "link"})
+    span = _first(XP_RESSORT_LINK(article))
     assert span is not None, "Unable to extract Ressort tag"
-    ressort_link_text = span.get_text()
+    ressort_link_text = span.text_content()
     match = re.match(r"\[Übersicht (.+)\]", ressort_link_text)
     assert match is not None, f"Unexpected Ressort link text {ressort_link_text}"
     return match.group(1)
 
 
-def _find_content_quickly(article: BeautifulSoup) -> str:
-    content_html = article.find("div", {"class": "article_text"})
-    return content_html.get_text(separator="\n\n")
+def _find_content_quickly(article: html.HtmlElement) -> str:
+    content_html = _first(XP_ARTICLE_TEXT(article))
+    return "\n\n".join(content_html.itertext())
 
 
-def _find_content(article: BeautifulSoup) -> str:
-    content = ""
-    if (subtitle := article.find("h3", {"class": "subtitle"})) is not None:
-        content += subtitle.get_text()
-    content_html = article.find("div", {"class": "article_text"})
+def _find_content(article: html.HtmlElement) -> str:
+    subtitle = _first(XP_SUBTITLE(article))
+    parts = [subtitle.text_content() if subtitle is not None else ""]
+    content_html = _first(XP_ARTICLE_TEXT(article))
     # remove blockquotes as they repeat text that will come later
-    for blockquote in content_html.select("blockquote"):
-        blockquote.extract()
-    for paragraph in content_html.find_all("p", {"class": "paragraph"}):
-        content += "\n\n" + paragraph.get_text()
-    return content
+    for blockquote in XP_BLOCKQUOTES(content_html):
+        blockquote.drop_tree()
+    parts.extend(paragraph.text_content() for paragraph in XP_PARAGRAPHS(content_html))
+    return "\n\n".join(parts)
+
+
+def _first(elements: list[html.HtmlElement]) -> html.HtmlElement | None:
+    return elements[0] if elements else None
+
+
+ARTICLE_NAME_RE = re.compile(r"OEBPS/article_[^/]*\.xhtml")
 
 
-def _extract_epub(epub_file_path: pathlib.Path, directory_to_extract_to: pathlib.Path) -> list[pathlib.Path]:
+def _find_article_names(epub_file: zipfile.ZipFile) -> list[str]:
     """
-    Extract an epub file.
-    :return: paths to the files containing the actual articles.
+    Find the files in an epub that contain the actual articles.
+    :return: names of these files within the epub.
     """
+    return [name for name in epub_file.namelist() if ARTICLE_NAME_RE.fullmatch(name)]
+
+
+def _extract_articles_from_epub(epub_file_path: pathlib.Path, article_names: list[str]) -> list[Article]:
+    """Extract the articles stored in the given files of an epub without unpacking it."""
     with zipfile.ZipFile(epub_file_path, "r") as epub_file:
-        epub_file.extractall(directory_to_extract_to)
-    return list(pathlib.Path(directory_to_extract_to / "OEBPS").glob("article_*.xhtml"))
+        articles = []
+        for article_name in article_names:
+            with io.BufferedReader(epub_file.open(article_name), buffer_size=ZIP_READ_BUFFER_SIZE) as xhtml_file:
+                articles.append(extract_article(xhtml_file))
+        return articles
+
+
+WHITESPACE_RE = re.compile(r"\s+")
+UMLAUTS_TABLE = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "Ä": "Ae", "Ö": "Oe", "Ü": "Ue", "ß": "ss"})
+NON_FILE_NAME_CHARACTER_RE = re.compile(r"[^a-zA-Z0-9_-]")
+REPEATED_DASHES_RE = re.compile(r"--+")
 
 
 def _make_string_file_name_compatible(string: str) -> str:
-    string = re.sub(r"\s+", "-", string)
-    string = re.sub(r"ä", "ae", string)
-    string = re.sub(r"ö", "oe", string)
-    string = re.sub(r"ü", "ue", string)
-    string = re.sub(r"Ä", "Ae", string)
-    string = re.sub(r"Ö", "Oe", string)
-    string = re.sub(r"Ü", "Ue", string)
-    string = re.sub(r"ß", "ss", string)
-    string = re.sub(r"[^a-zA-Z0-9_-]", "", string)
-    string = re.sub(r"--+", "-", string)
+    string = WHITESPACE_RE.sub("-", string)
+    string = string.translate(UMLAUTS_TABLE)
+    string = NON_FILE_NAME_CHARACTER_RE.sub("", string)
+    string = REPEATED_DASHES_RE.sub("-", string)
     string = string.strip("-")
     return string
 
@@ -10,11 +10,21 @@ import json
 import logging
 import re
 import tempfile
+import threading
 import time
 from dataclasses import dataclass
 from typing import Optional
 
 from selenium import webdriver
+from selenium.webdriver.remote.webelement import WebElement
+
+try:
+    # get notified by the OS when a download completes instead of polling
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = None
+    Observer = None
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +35,9 @@ logger = logging.getLogger(__name__)
 # - `driver.get_cookies()` and store the result
 LOGIN_COOKIE_FILE = pathlib.Path("~/.config/zeit_extractor/zeit_de_login_cookie.json").expanduser()
 
+# overview of the (current) issues; the browser is on this page after login
+EPAPER_URL = "https://epaper.zeit.de/abo/diezeit/"
+
 
 def make_firefox_options(download_dir: pathlib.Path) -> webdriver.FirefoxOptions:
     """
@@ -46,13 +59,13 @@ def make_firefox_options(download_dir: pathlib.Path) -> webdriver.FirefoxOptions
 
 
 def _login(driver: webdriver.Firefox) -> None:
-    driver.get("https://epaper.zeit.de/abo/diezeit/")
+    driver.get(EPAPER_URL)
 
     with open(LOGIN_COOKIE_FILE, "r") as cookie_file:
         cookie = json.load(cookie_file)
     driver.add_cookie(cookie)
 
-    driver.get("https://epaper.zeit.de/abo/diezeit/")
+    driver.get(EPAPER_URL)
 
 
 @dataclass
@@ -65,7 +78,10 @@ _METADATA_RE = re.compile(r"DIE ZEIT (\d+)/(\d+)")
 
 
 def _get_metadata(driver: webdriver.Firefox) -> IssueMetadata:
-    driver.get("https://epaper.zeit.de/abo/diezeit/")
+    """
+    Read the metadata of the current issue from the ``EPAPER_URL`` page (which
+    has to be loaded already).
+    """
     current_issue_box = driver.find_element_by_css_selector("div.epaper-highlighted")
     metadata = current_issue_box.find_element_by_css_selector("p.epaper-info-title")
     match = _METADATA_RE.match(metadata.text)
@@ -76,9 +92,7 @@ def _get_metadata(driver: webdriver.Firefox) -> IssueMetadata:
     return IssueMetadata(issue, year)
 
 
-def _get_epub(driver: webdriver.Firefox) -> None:
-    driver.get("https://epaper.zeit.de/abo/diezeit/")
-    current_edition_link = driver.find_element_by_link_text("ZUR AKTUELLEN AUSGABE")
+def _get_epub(driver: webdriver.Firefox, current_edition_link: WebElement) -> None:
     current_edition_link.click()
     driver.find_element_by_link_text("EPUB FÜR E-READER LADEN").click()
 
@@ -129,11 +143,57 @@ def wait_download_complete(path: pathlib.Path, timeout: datetime.timedelta | int
     """
     if isinstance(timeout, int):
         timeout = datetime.timedelta(seconds=timeout)
+    if is_download_complete(path):
+        return
     start = datetime.datetime.now()
-    while not is_download_complete(path):
-        if datetime.datetime.now() > start + timeout:
-            raise TimeoutError(f"Waiting for download of {path} timed out after {timeout}.")
-        time.sleep(1)
+    part_file_gone = threading.Event()
+    observer = _watch_part_file(path, part_file_gone)
+    try:
+        # poll often at first to not delay short downloads, then back off; with
+        # file system events, wake up as soon as the download completes, but
+        # still re-check regularly in case an event is missed (e.g. on network
+        # file systems)
+        delay = 0.05
+        while not is_download_complete(path):
+            if datetime.datetime.now() > start + timeout:
+                raise TimeoutError(f"Waiting for download of {path} timed out after {timeout}.")
+            if observer is not None:
+                if part_file_gone.wait(1.0):
+                    part_file_gone.clear()
+            else:
+                time.sleep(delay)
+                delay = min(2 * delay, 1.0)
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def _watch_part_file(path: pathlib.Path, part_file_gone: threading.Event) -> Optional["Observer"]:
+    """
+    Start watching the directory of the given download and set
+    ``part_file_gone`` once its ``.part`` file is gone (deleted or renamed).
+    Return the started observer or ``None``, if file system events are not
+    available.
+    """
+    if Observer is None:
+        return None
+    part_file = path.parent / (path.name + ".part")
+
+    class PartFileHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if not part_file.exists():
+                part_file_gone.set()
+
+    observer = Observer()
+    try:
+        observer.schedule(PartFileHandler(), str(path.parent))
+        observer.start()
+    except OSError as error:
+        # e.g. the inotify watch/instance limit is reached
+        logger.warning(f"Unable to watch {path.parent} ({error}); polling instead.")
+        return None
+    return observer
 
 
 @dataclass
@@ -156,9 +216,9 @@ def get_current_zeit(
 ) -> ZeitIssue:
     """
     Download epub and/or audio of the current issue to the given ``target_directory``.
-    When this function returns, the data is not necessaritly downloaded
-    completely; use one of the ``*_download_complete`` functions to make sure,
-    that a download is complete.
+    Both downloads are only started (and run in parallel): when this function
+    returns, the data is not necessaritly downloaded completely; use one of the
+    ``*_download_complete`` functions to make sure, that a download is complete.
     """
     options = make_firefox_options(target_directory)
     driver = webdriver.Firefox(options=options, service_log_path=os.path.devnull)
@@ -169,7 +229,9 @@ def get_current_zeit(
 
     if get_epub:
         logger.info(f"Obtaining epub file for {metadata.year}-{metadata.issue}.")
-        _get_epub(driver)
+        # still on the ``EPAPER_URL`` page after ``_get_metadata``
+        current_edition_link = driver.find_element_by_link_text("ZUR AKTUELLEN AUSGABE")
+        _get_epub(driver, current_edition_link)
         epub_file = _find_file_by_extension(target_directory, ".epub")
     else:
         epub_file = None
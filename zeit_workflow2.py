@@ -12,29 +12,81 @@ import shutil
 import warnings
 import zipfile
 
+try:
+    # much faster fuzzy matching; fall back to difflib if not installed
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = None
+    process = None
+
 from zeit_website import get_current_zeit, wait_download_complete
 from zeit_extractor2 import StoredArticle, extract_articles, store_articles, load_options_from_config_file, Article
 
 
+# make rule turning the article text files into audio files
+TTS_MAKE_RULE = "\n%.txt.mp3: %.txt\n\tazure_vorleser --voice de-DE-Stefan-Apollo --rate 2.3 $<\n\n"
+
+# copy the audio files out of their zip in large blocks
+ZIP_COPY_BUFFER_SIZE = 1024 * 1024
+
+SIMILARITY_CUTOFF = 0.6  # default of ``difflib.get_close_matches``
+
+
 def _is_similar_string_contained(string: str, other_strings: list[str]) -> bool:
-    return len(difflib.get_close_matches(string, other_strings)) != 0
+    if string in other_strings:
+        return True
+    # the similarity ratio can not exceed 2 * min(lengths) / sum(lengths), so
+    # strings of too different length are dropped before running difflib
+    length = len(string)
+    candidates = [
+        other for other in other_strings if 2.0 * min(length, len(other)) / (length + len(other)) >= SIMILARITY_CUTOFF
+    ]
+    if process is not None:
+        match = process.extractOne(string, candidates, scorer=fuzz.ratio, score_cutoff=SIMILARITY_CUTOFF * 100)
+        return match is not None
+    # same checks as ``difflib.get_close_matches``, but stop at the first match
+    # instead of scoring (and sorting) all candidates; the matcher indexes
+    # ``string`` only once
+    matcher = difflib.SequenceMatcher()
+    matcher.set_seq2(string)
+    for candidate in candidates:
+        matcher.set_seq1(candidate)
+        if (
+            matcher.real_quick_ratio() >= SIMILARITY_CUTOFF
+            and matcher.quick_ratio() >= SIMILARITY_CUTOFF
+            and matcher.ratio() >= SIMILARITY_CUTOFF
+        ):
+            return True
+    return False
+
+
+def _normalize_title(title: str) -> str:
+    """Reduce a title to its lowercase letters and digits."""
+    return "".join(character for character in title.lower() if character.isalnum())
 
 
 def remove_if_matching_title(articles: list[Article], titles: list[str]) -> list[Article]:
     """Return all ``articles`` whose titles are not (close to) any of the passed ``titles``."""
-    return [a for a in articles if not _is_similar_string_contained(a.title, titles)]
+    # normalize the titles once, not once per article
+    normalized_titles = frozenset(map(_normalize_title, titles))
+    remaining_articles = []
+    for article in articles:
+        # most titles match up to case and punctuation; only the others need
+        # fuzzy matching, which compares the raw titles
+        if _normalize_title(article.title) in normalized_titles or _is_similar_string_contained(
+            article.title, titles
+        ):
+            continue
+        remaining_articles.append(article)
+    return remaining_articles
 
 
 def _make_tts_makefile(stored_article: list[StoredArticle], directory: pathlib.Path):
     warnings.warn("Please use python instead of make!")
     path_to_makefile = directory / "Makefile-tts"
     with open(path_to_makefile, "w", encoding="utf-8") as makefile:
-        makefile.write("all: ")
-        for article in stored_article:
-            makefile.write(f" {article.path}.mp3 ")
-        makefile.write("\n\n")
-        makefile.write("\n%.txt.mp3: %.txt\n")
-        makefile.write("\tazure_vorleser --voice de-DE-Stefan-Apollo --rate 2.3 $<\n\n")
+        targets = "".join(f" {article.path}.mp3 " for article in stored_article)
+        makefile.write(f"all: {targets}\n\n{TTS_MAKE_RULE}")
     print("Makefile available at ", path_to_makefile)
 
     path_to_script = directory / "make-tts.sh"
@@ -49,9 +101,8 @@ def _make_audio_makefile(audio_files: list[pathlib.Path], directory: pathlib.Pat
 
     path_to_script = directory / "make-audio.sh"
     with open(path_to_script, "w", encoding="utf-8") as script:
-        script.write("#!/usr/bin/env bash\n\n")
-        for audio_file in audio_files:
-            script.write(f"downsample_mp3 --rate 2.3 {audio_file.name}\n")
+        commands = "".join(f"downsample_mp3 --rate 2.3 {audio_file.name}\n" for audio_file in audio_files)
+        script.write(f"#!/usr/bin/env bash\n\n{commands}")
     print("Build script available at ", path_to_script)
 
 
@@ -61,6 +112,9 @@ def main():
     print("Fetching the current Zeit issue.")
     current_zeit = get_current_zeit(target_directory=temp_dir)
     print(current_zeit)
+    # both downloads run in the browser at the same time; the audio files are
+    # only needed after the articles are extracted and stored
+    wait_download_complete(current_zeit.epub_file)
     shutil.copy(
         current_zeit.epub_file,
         pathlib.Path("/tmp") / f"die_zeit_{current_zeit.metadata.year}-{current_zeit.metadata.issue:02}.epub",
@@ -79,10 +133,12 @@ def main():
     wait_download_complete(current_zeit.audio_zip_file)
     audio_files = []
     with zipfile.ZipFile(current_zeit.audio_zip_file, "r") as audio_zip:
-        zipped_filenames = audio_zip.namelist()
-        for zipped_filename in zipped_filenames:
-            extracted_filename = pathlib.Path(audio_zip.extract(zipped_filename, path="output_path"))
-            audio_file = shutil.move(extracted_filename, output_path / f"001_{extracted_filename.name}")
+        for zipped_file in audio_zip.infolist():
+            if zipped_file.is_dir():
+                continue
+            audio_file = output_path / f"001_{pathlib.PurePosixPath(zipped_file.filename).name}"
+            with audio_zip.open(zipped_file) as source, open(audio_file, "wb") as target:
+                shutil.copyfileobj(source, target, ZIP_COPY_BUFFER_SIZE)
             audio_files.append(audio_file)
     _make_audio_makefile(audio_files, output_path)
 